@@ -0,0 +1,554 @@
+"""
+A B-tree is a balanced search tree in which every node holds many keys and has one more child than it has keys. All
+leaves sit at the same depth, and because a node with hundreds of keys fills exactly one disk page, a lookup among
+billions of keys touches only a handful of pages. That makes it the usual choice when the keys do not fit in memory.
+
+                                        [ 40 | 80 ]
+                                      /      |      \
+                            [10 | 20]   [50 | 60 | 70]   [90]
+
+This implementation keeps the tree in a single file of fixed-size pages accessed through mmap:
+    - page 0 is a header with the page size, the root page, the number of pages and the number of keys;
+    - every other page is a node: a leaf flag, the key count, the keys and, for inner nodes, the child page numbers.
+Opening an existing file only reads the header, and nodes are decoded on demand and kept in an LRU page cache.
+
+Changes stay in memory until flush(). flush() first copies the original contents of every page it is about to
+overwrite into a rollback journal next to the file and syncs it, then writes the new pages and deletes the journal.
+If the process dies half way, the next open finds the journal and restores the last flushed state.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+HEADER = struct.Struct("<8sIQQQ")  # magic, page size, root page, page count, key count
+NODE_HEADER = struct.Struct("<BxH")  # is leaf, key count
+MAX_NODE_KEYS = 0xFFFF  # The key count field is an unsigned 16-bit integer
+JOURNAL_HEADER = struct.Struct("<8sIQ")  # magic, page size, page count before the flush
+JOURNAL_TRAILER = struct.Struct("<QI")  # number of saved pages, CRC32 of the saved pages
+MAGIC = b"BTREE001"
+JOURNAL_MAGIC = b"BTJRNL01"
+
+
+class BTreeNode:
+    def __init__(self, page: int, leaf: bool, keys: Optional[List[int]] = None, children: Optional[List[int]] = None):
+        """
+        Initialize a B-tree node.
+
+        Args:
+            page (int): The page number the node is stored at.
+            leaf (bool): True if the node has no children.
+            keys (List[int], optional): The keys of the node in ascending order.
+            children (List[int], optional): The page numbers of the children; one more than the keys for inner nodes.
+        """
+        self.page: int = page
+        self.leaf: bool = leaf
+        self.keys: List[int] = keys if keys is not None else []
+        self.children: List[int] = children if children is not None else []
+
+
+class BTree:
+    def __init__(self, path: str, page_size: int = 4096, cache_pages: int = 1024):
+        """
+        Open the B-tree stored at path, creating an empty one if the file does not exist.
+
+        Opening an existing tree reads the header only, so it takes the same time whatever the size of the tree.
+
+        Args:
+            path (str): The file that stores the tree.
+            page_size (int, optional): The page size in bytes for a new file. Existing files keep their own.
+            cache_pages (int, optional): How many decoded pages to keep in memory. Pages changed since the last
+                flush cannot be evicted, so insert flushes on its own once they outnumber the cache.
+        """
+        self.path: str = path
+        self.journal_path: str = path + "-journal"
+        self.cache_pages: int = cache_pages
+        self.cache: "OrderedDict[int, BTreeNode]" = OrderedDict()
+        self.dirty: Set[int] = set()
+
+        if not os.path.exists(path):
+            self._create(page_size)
+        self.file = open(path, "r+b")
+        self._recover()
+        self._map()
+        magic, self.page_size, self.root, self.page_count, self.key_count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.mm.close()
+            self.file.close()
+            raise ValueError(f"'{path}' is not a B-tree file.")
+        # Nodes with the maximum number of keys still have room for one more child pointer than keys.
+        self.max_keys: int = (self.page_size - NODE_HEADER.size - 8) // 16
+        self.header_dirty: bool = False
+
+    def _create(self, page_size: int) -> None:
+        """
+        Write a new file holding only the header page of an empty tree.
+
+        Args:
+            page_size (int): The page size in bytes.
+        """
+        if page_size < 64:
+            raise ValueError("Page size must be at least 64 bytes.")
+        if (page_size - NODE_HEADER.size - 8) // 16 > MAX_NODE_KEYS:
+            raise ValueError(f"Page size must be at most {NODE_HEADER.size + 8 + 16 * MAX_NODE_KEYS + 15} bytes.")
+        with open(self.path, "wb") as f:
+            page = bytearray(page_size)
+            HEADER.pack_into(page, 0, MAGIC, page_size, 0, 1, 0)
+            f.write(page)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _map(self) -> None:
+        """
+        Memory-map the whole file.
+        """
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+
+    def __enter__(self) -> "BTree":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.key_count
+
+    def close(self) -> None:
+        """
+        Flush pending changes and close the file.
+        """
+        if self.file.closed:
+            return
+        self.flush()
+        self.mm.close()
+        self.file.close()
+
+    # ------------------------------------------------ Page access ------------------------------------------------
+
+    def _read_node(self, page: int) -> BTreeNode:
+        """
+        Get the node stored at a page, decoding it from the file if it is not cached.
+
+        Args:
+            page (int): The page number.
+
+        Returns:
+            BTreeNode: The node.
+        """
+        node = self.cache.get(page)
+        if node is not None:
+            self.cache.move_to_end(page)
+            return node
+
+        offset = page * self.page_size
+        leaf, count = NODE_HEADER.unpack_from(self.mm, offset)
+        offset += NODE_HEADER.size
+        keys = list(struct.unpack_from(f"<{count}q", self.mm, offset))
+        children = [] if leaf else list(struct.unpack_from(f"<{count + 1}Q", self.mm, offset + 8 * count))
+        node = BTreeNode(page, bool(leaf), keys, children)
+        self._cache(node)
+        return node
+
+    def _cache(self, node: BTreeNode) -> None:
+        """
+        Put a node in the page cache and evict least recently used clean pages above the capacity.
+
+        Args:
+            node (BTreeNode): The node to cache.
+        """
+        self.cache[node.page] = node
+        self.cache.move_to_end(node.page)
+        if len(self.cache) > self.cache_pages:
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used pages until the cache is within capacity, skipping pages not flushed yet.
+        """
+        excess = len(self.cache) - self.cache_pages
+        victims = []
+        for page in self.cache:
+            if len(victims) >= excess:
+                break
+            if page not in self.dirty:
+                victims.append(page)
+        for page in victims:
+            del self.cache[page]
+
+    def _new_node(self, leaf: bool) -> BTreeNode:
+        """
+        Allocate a node on a fresh page at the end of the file.
+
+        Args:
+            leaf (bool): True for a leaf node.
+
+        Returns:
+            BTreeNode: The new, empty node.
+        """
+        node = BTreeNode(self.page_count, leaf)
+        self.page_count += 1
+        self.header_dirty = True
+        self._mark_dirty(node)
+        return node
+
+    def _mark_dirty(self, node: BTreeNode) -> None:
+        self.dirty.add(node.page)
+        self._cache(node)
+
+    def _encode(self, node: BTreeNode) -> bytes:
+        """
+        Serialize a node into a page.
+
+        Args:
+            node (BTreeNode): The node to serialize.
+
+        Returns:
+            bytes: The page contents, without padding.
+        """
+        count = len(node.keys)
+        data = NODE_HEADER.pack(node.leaf, count) + struct.pack(f"<{count}q", *node.keys)
+        if not node.leaf:
+            data += struct.pack(f"<{count + 1}Q", *node.children)
+        return data
+
+    def _ensure_capacity(self, pages: int) -> None:
+        """
+        Grow the file, doubling its size, until it can hold the given number of pages.
+
+        Args:
+            pages (int): The number of pages needed.
+        """
+        needed = pages * self.page_size
+        if needed <= len(self.mm):
+            return
+        size = len(self.mm)
+        while size < needed:
+            size *= 2
+        self.mm.close()
+        self.file.truncate(size)
+        self._map()
+
+    # ------------------------------------------------ Durability -------------------------------------------------
+
+    def flush(self) -> None:
+        """
+        Write all pending changes to the file so they survive a crash.
+
+        Pages that already existed at the last flush are first saved to the rollback journal, which is synced before
+        the file is touched. The journal is removed once the file itself is synced, which is the commit point.
+        """
+        if not self.dirty and not self.header_dirty:
+            return
+        _, _, _, committed_pages, _ = HEADER.unpack_from(self.mm, 0)
+        overwritten = sorted(page for page in self.dirty if page < committed_pages)
+        self._write_journal([0] + overwritten, committed_pages)
+
+        self._ensure_capacity(self.page_count)
+        for page in sorted(self.dirty):
+            data = self._encode(self.cache[page])
+            offset = page * self.page_size
+            self.mm[offset:offset + len(data)] = data
+        HEADER.pack_into(self.mm, 0, MAGIC, self.page_size, self.root, self.page_count, self.key_count)
+        self.mm.flush()
+        os.fsync(self.file.fileno())
+
+        os.remove(self.journal_path)
+        _fsync_directory(self.path)
+        self.dirty.clear()
+        self.header_dirty = False
+        self._evict()
+
+    def _write_journal(self, pages: List[int], committed_pages: int) -> None:
+        """
+        Save the current on-disk contents of the given pages to the rollback journal and sync it.
+
+        Args:
+            pages (List[int]): The pages about to be overwritten.
+            committed_pages (int): The page count of the last flushed state.
+        """
+        crc = 0
+        with open(self.journal_path, "wb") as journal:
+            journal.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, self.page_size, committed_pages))
+            for page in pages:
+                offset = page * self.page_size
+                entry = struct.pack("<Q", page) + self.mm[offset:offset + self.page_size]
+                crc = zlib.crc32(entry, crc)
+                journal.write(entry)
+            journal.write(JOURNAL_TRAILER.pack(len(pages), crc))
+            journal.flush()
+            os.fsync(journal.fileno())
+        _fsync_directory(self.path)
+
+    def _recover(self) -> None:
+        """
+        Roll back an interrupted flush by restoring the pages saved in the journal, if there is one.
+
+        A journal without a valid trailer was never completed, which means the file was not touched yet and the
+        journal can simply be discarded.
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as journal:
+            data = journal.read()
+        if len(data) >= JOURNAL_HEADER.size + JOURNAL_TRAILER.size:
+            magic, page_size, committed_pages = JOURNAL_HEADER.unpack_from(data, 0)
+            count, crc = JOURNAL_TRAILER.unpack_from(data, len(data) - JOURNAL_TRAILER.size)
+            entries = data[JOURNAL_HEADER.size:len(data) - JOURNAL_TRAILER.size]
+            entry_size = 8 + page_size
+            if magic == JOURNAL_MAGIC and len(entries) == count * entry_size and zlib.crc32(entries) == crc:
+                for i in range(count):
+                    entry = entries[i * entry_size:(i + 1) * entry_size]
+                    (page,) = struct.unpack_from("<Q", entry, 0)
+                    self.file.seek(page * page_size)
+                    self.file.write(entry[8:])
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        os.remove(self.journal_path)
+        _fsync_directory(self.path)
+
+    # ------------------------------------------------ Tree operations --------------------------------------------
+
+    def search(self, key: int) -> bool:
+        """
+        Search for a key in the tree.
+
+        Args:
+            key (int): The key to search for.
+
+        Returns:
+            bool: True if the key is in the tree, False otherwise.
+        """
+        page = self.root
+        while page:
+            node = self._read_node(page)
+            i = bisect.bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return True
+            if node.leaf:
+                return False
+            page = node.children[i]
+        return False
+
+    def insert(self, key: int) -> None:
+        """
+        Insert a key into the tree. Duplicates are ignored.
+
+        Full nodes are split on the way down, so the insert never has to walk back up the tree.
+
+        Args:
+            key (int): The key to insert; it must fit in a signed 64-bit integer.
+        """
+        if not self.root:
+            root = self._new_node(leaf=True)
+            root.keys.append(key)
+            self.root = root.page
+            self.key_count += 1
+            return
+
+        node = self._read_node(self.root)
+        if len(node.keys) >= self.max_keys:
+            new_root = self._new_node(leaf=False)
+            new_root.children.append(node.page)
+            self._split_child(new_root, 0, node)
+            self.root = new_root.page
+            node = new_root
+
+        while True:
+            i = bisect.bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return
+            if node.leaf:
+                node.keys.insert(i, key)
+                self._mark_dirty(node)
+                self.key_count += 1
+                self.header_dirty = True
+                if len(self.dirty) > self.cache_pages:
+                    self.flush()
+                return
+            child = self._read_node(node.children[i])
+            if len(child.keys) >= self.max_keys:
+                self._split_child(node, i, child)
+                if key == node.keys[i]:
+                    return
+                if key > node.keys[i]:
+                    child = self._read_node(node.children[i + 1])
+            node = child
+
+    def _split_child(self, parent: BTreeNode, i: int, child: BTreeNode) -> None:
+        """
+        Split a full child in two and move its middle key up into the parent.
+
+        Args:
+            parent (BTreeNode): The parent node, which must not be full.
+            i (int): The position of the child among the parent's children.
+            child (BTreeNode): The full child node.
+        """
+        mid = len(child.keys) // 2
+        sibling = self._new_node(child.leaf)
+        sibling.keys = child.keys[mid + 1:]
+        if not child.leaf:
+            sibling.children = child.children[mid + 1:]
+            del child.children[mid + 1:]
+        parent.keys.insert(i, child.keys[mid])
+        parent.children.insert(i + 1, sibling.page)
+        del child.keys[mid:]
+        self._mark_dirty(child)
+        self._mark_dirty(parent)
+
+    def iter_inorder(self) -> Iterator[int]:
+        """
+        Lazily yield all keys in ascending order, holding one node per level.
+
+        Yields:
+            int: The next key in ascending order.
+        """
+        if not self.root:
+            return
+        stack: List[Tuple[BTreeNode, int]] = [(self._read_node(self.root), 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.leaf:
+                yield from node.keys
+                continue
+            # Reaching (node, i) means child i - 1 is done: yield the key after it, then descend into child i.
+            if i > 0:
+                yield node.keys[i - 1]
+            if i + 1 < len(node.children):
+                stack.append((node, i + 1))
+            stack.append((self._read_node(node.children[i]), 0))
+
+    def inorder_traversal(self) -> List[int]:
+        """
+        Get all keys in ascending order.
+
+        Returns:
+            List[int]: The keys in ascending order.
+        """
+        return list(self.iter_inorder())
+
+    def bulk_load(self, keys: Iterable[int]) -> None:
+        """
+        Build the tree bottom up from keys in ascending order and flush it.
+
+        Keys are spread evenly over as few leaves as possible and each level is written straight to the file, so
+        only the separator keys of the level being built are held in memory. The tree must be empty.
+
+        Args:
+            keys (Iterable[int]): The keys in strictly ascending order.
+
+        Raises:
+            ValueError: If the tree is not empty or the keys are not in ascending order.
+        """
+        if self.root:
+            raise ValueError("Bulk load needs an empty tree.")
+        data = list(keys)
+        if any(a >= b for a, b in zip(data, data[1:])):
+            raise ValueError("Keys must be in strictly ascending order.")
+        if not data:
+            return
+
+        # A leaf level of `count` leaves holds len(data) - (count - 1) keys; the rest become separators.
+        count = -(-(len(data) + 1) // (self.max_keys + 1))
+        children: List[int] = []
+        separators: List[int] = []
+        position = 0
+        for size in _even_sizes(len(data) - (count - 1), count):
+            children.append(self._write_page(True, data[position:position + size]))
+            position += size
+            if position < len(data):
+                separators.append(data[position])
+                position += 1
+
+        while len(children) > 1:
+            groups = -(-len(children) // (self.max_keys + 1))
+            next_children: List[int] = []
+            next_separators: List[int] = []
+            position = 0
+            for size in _even_sizes(len(children), groups):
+                next_children.append(self._write_page(
+                    False, separators[position:position + size - 1], children[position:position + size]))
+                position += size
+                if position < len(children):
+                    next_separators.append(separators[position - 1])
+            children, separators = next_children, next_separators
+
+        self.root = children[0]
+        self.key_count = len(data)
+        self.header_dirty = True
+        self.flush()
+
+    def _write_page(self, leaf: bool, keys: List[int], children: Optional[List[int]] = None) -> int:
+        """
+        Write a node straight to a new page, bypassing the page cache.
+
+        New pages lie beyond the last flushed page count, so they need no journal entry.
+
+        Args:
+            leaf (bool): True for a leaf node.
+            keys (List[int]): The keys of the node.
+            children (List[int], optional): The child pages of an inner node.
+
+        Returns:
+            int: The page number.
+        """
+        page = self.page_count
+        self.page_count += 1
+        self._ensure_capacity(self.page_count)
+        data = self._encode(BTreeNode(page, leaf, keys, children))
+        offset = page * self.page_size
+        self.mm[offset:offset + len(data)] = data
+        return page
+
+
+def _even_sizes(total: int, parts: int) -> List[int]:
+    """
+    Split a total into a number of parts whose sizes differ by at most one.
+
+    Args:
+        total (int): The total to split.
+        parts (int): The number of parts.
+
+    Returns:
+        List[int]: The part sizes.
+    """
+    base, extra = divmod(total, parts)
+    return [base + 1 if i < extra else base for i in range(parts)]
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Sync the directory containing path so that created and deleted files are durable. Not every platform allows it.
+
+    Args:
+        path (str): A file in the directory.
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Example usage
+import tempfile
+
+with tempfile.TemporaryDirectory() as directory:
+    tree_path = os.path.join(directory, "keys.btree")
+
+    with BTree(tree_path, page_size=256) as btree:
+        btree.bulk_load(range(0, 1000, 2))
+        btree.insert(501)
+
+    with BTree(tree_path) as btree:  # Reopening only reads the header
+        print("Keys:", len(btree))  # Output: Keys: 501
+        print("501 is in the tree:", btree.search(501))  # Output: 501 is in the tree: True
+        print("First keys:", btree.inorder_traversal()[:5])  # Output: First keys: [0, 2, 4, 6, 8]
@@ -3,96 +3,1640 @@ called a Min Heap. If each parent node is greater than or equal to its child nod
 very useful is implementing priority queues where the queue item with higher weightage is given more priority in
 processing."""
 
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Protocol, Tuple
 import heapq
+import random
+import threading
+import time
+import tracemalloc
+
 
 class MinMaxHeap:
-    def __init__(self):
+    """A min-max heap: a single array heap whose even levels are ordered like a min-heap and odd levels like a
+    max-heap. The minimum is at the root and the maximum is one of the root's children, so both ends can be read in
+    O(1) and removed in O(log n).
+
+    Without a key function the values themselves are compared. With one, each value is stored as a (key, insertion
+    number, value) tuple, so the values never need to be comparable and equal keys come out in insertion order.
+    """
+
+    def __init__(self, key: Optional[Callable[[Any], Any]] = None):
         """
         Initialize an empty min-max heap.
+
+        :param key: A function that computes the value's sort key, or None to compare the values directly.
         """
-        self.min_heap = []
-        self.max_heap = []
+        self.heap: List[Any] = []
+        self.key = key
+        self._counter = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    @classmethod
+    def from_iterable(cls, values: Iterable, key: Optional[Callable[[Any], Any]] = None) -> "MinMaxHeap":
+        """
+        Build a heap from many values at once in O(n), instead of O(n log n) for inserting them one by one.
+
+        :param values: The values.
+        :param key: A function that computes the value's sort key, or None to compare the values directly.
+        :return: The heap.
+        """
+        heap = cls(key)
+        heap.heap = heap._entries(values)
+        heap._heapify()
+        return heap
+
+    def _entries(self, values: Iterable) -> List:
+        """
+        Turn values into heap entries.
+
+        :param values: The values.
+        :return: The values themselves, or (key, insertion number, value) tuples when there is a key function.
+        """
+        if self.key is None:
+            return list(values)
+        key, counter = self.key, self._counter
+        return [(key(value), next(counter), value) for value in values]
+
+    def _heapify(self):
+        """
+        Restore the heap order of the whole array bottom-up (Floyd's method), trickling every parent down.
+        """
+        heap = self.heap
+        for i in range(len(heap) // 2 - 1, -1, -1):
+            if (i + 1).bit_length() & 1:
+                self._trickle_down_min(i, heap[i])
+            else:
+                self._trickle_down_max(i, heap[i])
+
+    def insert_many(self, values: Iterable):
+        """
+        Insert many values. When they outnumber the values already in the heap, the whole heap is rebuilt in
+        linear time; otherwise they are inserted one by one.
+
+        :param values: The values to be inserted.
+        """
+        entries = self._entries(values)
+        if len(entries) >= len(self.heap):
+            self.heap.extend(entries)
+            self._heapify()
+            return
+        for entry in entries:
+            self._insert_entry(entry)
+
+    def extract_many(self, k: int, largest: bool = False) -> List:
+        """
+        Extract up to k values from one end of the heap.
+
+        :param k: How many values to extract.
+        :param largest: If True, extract the largest values instead of the smallest.
+        :return: The extracted values, smallest first (or largest first if largest is True).
+        """
+        extract = self.extract_max if largest else self.extract_min
+        return [extract() for _ in range(min(k, len(self.heap)))]
 
     def insert(self, value):
         """
-        Insert a value into both the min-heap and max-heap.
+        Insert a value into the heap.
 
         :param value: The value to be inserted.
         """
-        heapq.heappush(self.min_heap, value)
-        heapq.heappush(self.max_heap, -value)
+        self._insert_entry(value if self.key is None else (self.key(value), next(self._counter), value))
+
+    def _insert_entry(self, entry):
+        """
+        Append an entry and move it up to its place.
+
+        :param entry: The value, or its (key, insertion number, value) tuple.
+        """
+        heap = self.heap
+        i = len(heap)
+        heap.append(entry)
+        if i == 0:
+            return
+        parent = (i - 1) >> 1
+        if (i + 1).bit_length() & 1:  # On a min level
+            if heap[parent] < entry:
+                heap[i] = heap[parent]
+                self._bubble_up_max(parent, entry)
+            elif i > 2:
+                self._bubble_up_min(i, entry)
+        else:
+            if entry < heap[parent]:
+                heap[i] = heap[parent]
+                self._bubble_up_min(parent, entry)
+            elif i > 2:
+                self._bubble_up_max(i, entry)
+
+    def _bubble_up_min(self, i: int, entry):
+        """
+        Move an entry up through the min levels (grandparent by grandparent) and place it.
+
+        :param i: The index of the hole the entry starts in.
+        :param entry: The entry being placed.
+        """
+        heap = self.heap
+        while i > 2:
+            grandparent = (i - 3) >> 2
+            if entry < heap[grandparent]:
+                heap[i] = heap[grandparent]
+                i = grandparent
+            else:
+                break
+        heap[i] = entry
+
+    def _bubble_up_max(self, i: int, entry):
+        """
+        Move an entry up through the max levels (grandparent by grandparent) and place it.
+
+        :param i: The index of the hole the entry starts in.
+        :param entry: The entry being placed.
+        """
+        heap = self.heap
+        while i > 2:
+            grandparent = (i - 3) >> 2
+            if heap[grandparent] < entry:
+                heap[i] = heap[grandparent]
+                i = grandparent
+            else:
+                break
+        heap[i] = entry
+
+    def _trickle_down_min(self, i: int, entry):
+        """
+        Place an entry into the hole at index i, which is on a min level, moving smaller descendants up.
+
+        :param i: The index of the hole.
+        :param entry: The entry being placed.
+        """
+        heap = self.heap
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            grandchild = 2 * child + 1
+            if grandchild + 3 < size:
+                # All four grandchildren exist, and each child is at least as large as its own children
+                smallest = grandchild
+                if heap[grandchild + 1] < heap[smallest]:
+                    smallest = grandchild + 1
+                if heap[grandchild + 2] < heap[smallest]:
+                    smallest = grandchild + 2
+                if heap[grandchild + 3] < heap[smallest]:
+                    smallest = grandchild + 3
+            else:
+                # The smallest of the (up to) two children and their children
+                smallest = child
+                for candidate in (child + 1, grandchild, grandchild + 1, grandchild + 2):
+                    if candidate < size and heap[candidate] < heap[smallest]:
+                        smallest = candidate
+            if not heap[smallest] < entry:
+                break
+            heap[i] = heap[smallest]
+            i = smallest
+            if smallest < grandchild:
+                break  # A child is on a max level, and nothing below it is smaller than it
+            parent = (smallest - 1) >> 1
+            if heap[parent] < entry:
+                heap[parent], entry = entry, heap[parent]
+        heap[i] = entry
+
+    def _trickle_down_max(self, i: int, entry):
+        """
+        Place an entry into the hole at index i, which is on a max level, moving larger descendants up.
+
+        :param i: The index of the hole.
+        :param entry: The entry being placed.
+        """
+        heap = self.heap
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            grandchild = 2 * child + 1
+            if grandchild + 3 < size:
+                largest = grandchild
+                if heap[largest] < heap[grandchild + 1]:
+                    largest = grandchild + 1
+                if heap[largest] < heap[grandchild + 2]:
+                    largest = grandchild + 2
+                if heap[largest] < heap[grandchild + 3]:
+                    largest = grandchild + 3
+            else:
+                largest = child
+                for candidate in (child + 1, grandchild, grandchild + 1, grandchild + 2):
+                    if candidate < size and heap[largest] < heap[candidate]:
+                        largest = candidate
+            if not entry < heap[largest]:
+                break
+            heap[i] = heap[largest]
+            i = largest
+            if largest < grandchild:
+                break
+            parent = (largest - 1) >> 1
+            if entry < heap[parent]:
+                heap[parent], entry = entry, heap[parent]
+        heap[i] = entry
+
+    def _value(self, entry):
+        return entry if self.key is None else entry[2]
+
+    def _max_index(self) -> int:
+        """
+        Find where the maximum is: the root if it is alone, otherwise the larger of the root's children.
+
+        :return: The index of the maximum.
+        """
+        heap = self.heap
+        if len(heap) <= 2:
+            return len(heap) - 1
+        return 1 if heap[2] < heap[1] else 2
 
     def extract_min(self):
         """
-        Extract and return the minimum value from the min-heap.
+        Extract and return the minimum value.
 
         :return: The minimum value.
         """
-        if not self.min_heap:
+        heap = self.heap
+        if not heap:
             raise IndexError("Min-Heap is empty.")
-        return heapq.heappop(self.min_heap)
+        last = heap.pop()
+        if not heap:
+            return self._value(last)
+        entry = heap[0]
+        self._trickle_down_min(0, last)
+        return self._value(entry)
 
     def extract_max(self):
         """
-        Extract and return the maximum value from the max-heap.
+        Extract and return the maximum value.
 
         :return: The maximum value.
         """
-        if not self.max_heap:
+        heap = self.heap
+        if not heap:
             raise IndexError("Max-Heap is empty.")
-        return -heapq.heappop(self.max_heap)
+        i = self._max_index()
+        last = heap.pop()
+        if i == len(heap):
+            return self._value(last)
+        entry = heap[i]
+        self._trickle_down_max(i, last)
+        return self._value(entry)
 
     def get_min(self):
         """
-        Get the minimum value from the min-heap without removing it.
+        Get the minimum value without removing it.
 
         :return: The minimum value.
         """
-        if not self.min_heap:
+        if not self.heap:
             raise IndexError("Min-Heap is empty.")
-        return self.min_heap[0]
+        return self._value(self.heap[0])
 
     def get_max(self):
         """
-        Get the maximum value from the max-heap without removing it.
+        Get the maximum value without removing it.
 
         :return: The maximum value.
         """
-        if not self.max_heap:
+        if not self.heap:
             raise IndexError("Max-Heap is empty.")
-        return -self.max_heap[0]
+        return self._value(self.heap[self._max_index()])
 
     def size_min(self):
         """
-        Get the number of elements in the min-heap.
+        Get the number of elements in the heap. Both ends share one array, so this is the same as size_max().
 
-        :return: The number of elements in the min-heap.
+        :return: The number of elements in the heap.
         """
-        return len(self.min_heap)
+        return len(self.heap)
 
     def size_max(self):
         """
-        Get the number of elements in the max-heap.
+        Get the number of elements in the heap. Both ends share one array, so this is the same as size_min().
 
-        :return: The number of elements in the max-heap.
+        :return: The number of elements in the heap.
         """
-        return len(self.max_heap)
+        return len(self.heap)
 
     def is_empty_min(self):
         """
-        Check if the min-heap is empty.
+        Check if the heap is empty.
 
-        :return: True if the min-heap is empty, otherwise False.
+        :return: True if the heap is empty, otherwise False.
         """
-        return len(self.min_heap) == 0
+        return len(self.heap) == 0
 
     def is_empty_max(self):
         """
-        Check if the max-heap is empty.
+        Check if the heap is empty.
+
+        :return: True if the heap is empty, otherwise False.
+        """
+        return len(self.heap) == 0
+
+
+class _DualHeap:
+    """The original MinMaxHeap, kept as a benchmark baseline: every value is stored twice, in a min-heap and in a
+    negated max-heap, and removing it from one side leaves it in the other."""
+
+    def __init__(self):
+        self.min_heap = []
+        self.max_heap = []
+
+    def insert(self, value):
+        heapq.heappush(self.min_heap, value)
+        heapq.heappush(self.max_heap, -value)
+
+    def extract_min(self):
+        return heapq.heappop(self.min_heap)
+
+    def extract_max(self):
+        return -heapq.heappop(self.max_heap)
+
+
+def benchmark_min_max_heap(n: int = 10 ** 6, seed: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    Compare MinMaxHeap with the original two-heap version on n random integers.
+
+    "insert" inserts every value, "extract" then alternates extract_min and extract_max until n values are out, and
+    "memory" is the number of bytes the filled heap allocates, measured with tracemalloc in a separate run. The
+    values are created beforehand, so only the heap's own storage is counted: list slots for MinMaxHeap, and list
+    slots plus a negated integer for every value in the max-heap of the baseline. The baseline's results are wrong
+    once both ends have been used, since a value extracted from one side stays in the other.
+
+    :param n: The number of values.
+    :param seed: The seed for the random values.
+    :return: The seconds taken ("insert", "extract") or bytes used ("memory"), then by "min-max" and "two heaps".
+    """
+    rng = random.Random(seed)
+    values = [rng.randrange(1 << 30) for _ in range(n)]
+    results: Dict[str, Dict[str, float]] = {"insert": {}, "extract": {}, "memory": {}}
+    for name, make_heap in (("min-max", MinMaxHeap), ("two heaps", _DualHeap)):
+        heap = make_heap()
+        start = time.perf_counter()
+        for value in values:
+            heap.insert(value)
+        results["insert"][name] = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(n // 2):
+            heap.extract_min()
+            heap.extract_max()
+        results["extract"][name] = time.perf_counter() - start
+
+        tracemalloc.start()
+        heap = make_heap()
+        for value in values:
+            heap.insert(value)
+        results["memory"][name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return results
+
+
+def merge_sorted(*streams: Iterable, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False) -> Iterator:
+    """
+    Lazily merge sorted streams into one sorted stream, holding only one value per stream at a time.
+
+    This is heapq.merge: a heap of the next value from every stream, so each value costs O(log k) for k streams.
+
+    :param streams: The sorted iterables.
+    :param key: A function that computes the value's sort key, or None to compare the values directly.
+    :param reverse: True if the streams are sorted largest first.
+    :return: An iterator over all values in sorted order.
+    """
+    return heapq.merge(*streams, key=key, reverse=reverse)
+
+
+class TopK:
+    """Keeps the k largest (or smallest) values seen in a stream of any length, in O(k) memory.
+
+    The kept values are in a MinMaxHeap, so the weakest one, which the next value has to beat, is always at hand.
+    """
+
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None, largest: bool = True):
+        """
+        Initialize an empty accumulator.
+
+        :param k: How many values to keep.
+        :param key: A function that computes the value's sort key, or None to compare the values directly.
+        :param largest: True to keep the largest values, False to keep the smallest.
+        """
+        if k < 0:
+            raise ValueError("k must not be negative.")
+        self.k = k
+        self.key = key
+        self.largest = largest
+        self.heap = MinMaxHeap(key)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, value):
+        """
+        Offer a value to the accumulator.
+
+        :param value: The value.
+        """
+        self.add_many((value,))
+
+    def add_many(self, values: Iterable):
+        """
+        Offer many values to the accumulator.
+
+        :param values: The values.
+        """
+        heap, k, largest = self.heap, self.k, self.largest
+        key = self.key or (lambda value: value)
+        values = iter(values)
+        if len(heap) < k:
+            for value in values:
+                heap.insert(value)
+                if len(heap) == k:
+                    break
+        if not heap.heap:
+            return
+        # Each value only has to be compared with the weakest kept value; most values of a long stream lose
+        threshold = key(heap.get_min() if largest else heap.get_max())
+        for value in values:
+            value_key = key(value)
+            if (threshold < value_key) if largest else (value_key < threshold):
+                if largest:
+                    heap.extract_min()
+                    heap.insert(value)
+                    threshold = key(heap.get_min())
+                else:
+                    heap.extract_max()
+                    heap.insert(value)
+                    threshold = key(heap.get_max())
+
+    def items(self) -> List:
+        """
+        Get the kept values, best first.
+
+        :return: The kept values, largest first (or smallest first when keeping the smallest).
+        """
+        entries = sorted(self.heap.heap, reverse=self.largest)
+        return entries if self.key is None else [entry[2] for entry in entries]
+
+
+def benchmark_bulk_operations(n: int = 10 ** 7, k: int = 100, streams: int = 8,
+                              seed: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    Time the bulk operations on a stream of n random integers against their one-at-a-time or sorting equivalents.
+
+    "build" compares MinMaxHeap.from_iterable with n calls to insert, "top_k" compares TopK.add_many over the
+    stream with heapq.nlargest, and "merge" compares merge_sorted over the stream split into sorted parts with
+    sorting the concatenated parts. Answers are checked against each other.
+
+    :param n: The length of the stream.
+    :param k: How many of the largest values "top_k" keeps.
+    :param streams: How many sorted parts "merge" combines.
+    :param seed: The seed for the random values.
+    :return: The seconds taken, by operation and then by method.
+    """
+    rng = random.Random(seed)
+    values = [rng.randrange(1 << 30) for _ in range(n)]
+    parts = [sorted(values[i::streams]) for i in range(streams)]
+
+    def insert_one_by_one():
+        heap = MinMaxHeap()
+        for value in values:
+            heap.insert(value)
+        return heap.get_min(), heap.get_max()
+
+    def build_at_once():
+        heap = MinMaxHeap.from_iterable(values)
+        return heap.get_min(), heap.get_max()
+
+    def keep_top_k():
+        top = TopK(k)
+        top.add_many(values)
+        return top.items()
+
+    operations = {
+        "build": {"from_iterable": build_at_once, "insert": insert_one_by_one},
+        "top_k": {"TopK": keep_top_k, "nlargest": lambda: heapq.nlargest(k, values)},
+        "merge": {"merge_sorted": lambda: list(merge_sorted(*parts)),
+                  "sorted": lambda: sorted([value for part in parts for value in part])},
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for operation, methods in operations.items():
+        results[operation] = {}
+        answers = []
+        for name, run in methods.items():
+            start = time.perf_counter()
+            answers.append(run())
+            results[operation][name] = time.perf_counter() - start
+        if any(answer != answers[0] for answer in answers):
+            raise AssertionError(f"The methods disagree on {operation}.")
+    return results
+
+
+class PriorityQueue(Protocol):
+    """The operations shared by the addressable priority queues below (IndexedPriorityQueue, DaryHeap,
+    PairingHeap and RadixHeap), so they can be swapped for one another, e.g. as a route search frontier.
+
+    Items are distinct and hashable, the smallest priority comes out first, and items can be changed or removed.
+    """
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, item) -> bool: ...
+
+    def insert(self, item, priority): ...
+
+    def update(self, item, priority): ...
+
+    def decrease_key(self, item, priority): ...
+
+    def increase_key(self, item, priority): ...
+
+    def remove(self, item): ...
+
+    def get_min(self) -> Tuple[Any, Any]: ...
+
+    def extract_min(self) -> Tuple[Any, Any]: ...
+
+
+class IndexedPriorityQueue:
+    """A binary min-heap of distinct items that remembers where every item is, so an item's priority can be
+    changed, or the item removed, in O(log n) instead of pushing a duplicate and skipping the stale entry later.
+
+    Items must be hashable; only the priorities are compared.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty indexed priority queue.
+        """
+        self.items: List[Hashable] = []
+        self.priorities: List[Any] = []
+        self.position: Dict[Hashable, int] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def insert(self, item, priority):
+        """
+        Insert an item that is not in the queue yet.
+
+        :param item: The item to be inserted.
+        :param priority: Its priority; smaller priorities come out first.
+        """
+        if item in self.position:
+            raise ValueError(f"Item {item!r} is already in the queue.")
+        self.items.append(item)
+        self.priorities.append(priority)
+        self.position[item] = len(self.items) - 1
+        self._sift_up(len(self.items) - 1)
+
+    def update(self, item, priority):
+        """
+        Insert an item, or change its priority if it is already in the queue.
+
+        :param item: The item.
+        :param priority: Its new priority.
+        """
+        i = self.position.get(item)
+        if i is None:
+            self.insert(item, priority)
+            return
+        old_priority = self.priorities[i]
+        self.priorities[i] = priority
+        if priority < old_priority:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def decrease_key(self, item, priority):
+        """
+        Lower the priority of an item in the queue.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be greater than the current one.
+        """
+        i = self.position[item]
+        if self.priorities[i] < priority:
+            raise ValueError(f"New priority {priority!r} is greater than the current one.")
+        self.priorities[i] = priority
+        self._sift_up(i)
+
+    def increase_key(self, item, priority):
+        """
+        Raise the priority of an item in the queue.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be less than the current one.
+        """
+        i = self.position[item]
+        if priority < self.priorities[i]:
+            raise ValueError(f"New priority {priority!r} is less than the current one.")
+        self.priorities[i] = priority
+        self._sift_down(i)
+
+    def remove(self, item):
+        """
+        Remove an item from the queue.
+
+        :param item: The item to be removed.
+        :return: The item's priority.
+        """
+        i = self.position.pop(item)
+        priority = self.priorities[i]
+        last_item, last_priority = self.items.pop(), self.priorities.pop()
+        if i < len(self.items):
+            self.items[i], self.priorities[i] = last_item, last_priority
+            self.position[last_item] = i
+            if last_priority < priority:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+        return priority
+
+    def get_priority(self, item):
+        """
+        Get the priority of an item in the queue.
+
+        :param item: The item.
+        :return: Its priority.
+        """
+        return self.priorities[self.position[item]]
+
+    def get_min(self) -> Tuple[Any, Any]:
+        """
+        Get the item with the smallest priority without removing it.
+
+        :return: The item and its priority.
+        """
+        if not self.items:
+            raise IndexError("Priority queue is empty.")
+        return self.items[0], self.priorities[0]
+
+    def extract_min(self) -> Tuple[Any, Any]:
+        """
+        Extract and return the item with the smallest priority.
+
+        :return: The item and its priority.
+        """
+        if not self.items:
+            raise IndexError("Priority queue is empty.")
+        item = self.items[0]
+        return item, self.remove(item)
+
+    def _sift_up(self, i: int):
+        """
+        Move the entry at index i up until its parent's priority is not greater.
+
+        :param i: The index of the entry.
+        """
+        items, priorities, position = self.items, self.priorities, self.position
+        item, priority = items[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not priority < priorities[parent]:
+                break
+            items[i], priorities[i] = items[parent], priorities[parent]
+            position[items[i]] = i
+            i = parent
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+    def _sift_down(self, i: int):
+        """
+        Move the entry at index i down until neither child has a smaller priority.
+
+        :param i: The index of the entry.
+        """
+        items, priorities, position = self.items, self.priorities, self.position
+        size = len(items)
+        item, priority = items[i], priorities[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if not priorities[child] < priority:
+                break
+            items[i], priorities[i] = items[child], priorities[child]
+            position[items[i]] = i
+            i = child
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+
+class DaryHeap(IndexedPriorityQueue):
+    """An IndexedPriorityQueue in which every node has `arity` children instead of two.
+
+    A wider heap is shallower, so moving an entry up (insert, decrease_key) takes fewer steps, while moving it down
+    (extract_min) compares more children per level. Workloads with many decrease-key operations, like Dijkstra's
+    algorithm, tend to favor 4 or 8 children.
+    """
+
+    def __init__(self, arity: int = 4):
+        """
+        Initialize an empty d-ary heap.
+
+        :param arity: The number of children per node, at least 2.
+        """
+        if arity < 2:
+            raise ValueError("A heap needs at least two children per node.")
+        super().__init__()
+        self.arity = arity
+
+    def _sift_up(self, i: int):
+        """
+        Move the entry at index i up until its parent's priority is not greater.
+
+        :param i: The index of the entry.
+        """
+        items, priorities, position, arity = self.items, self.priorities, self.position, self.arity
+        item, priority = items[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) // arity
+            if not priority < priorities[parent]:
+                break
+            items[i], priorities[i] = items[parent], priorities[parent]
+            position[items[i]] = i
+            i = parent
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+    def _sift_down(self, i: int):
+        """
+        Move the entry at index i down until none of its children has a smaller priority.
+
+        :param i: The index of the entry.
+        """
+        items, priorities, position, arity = self.items, self.priorities, self.position, self.arity
+        size = len(items)
+        item, priority = items[i], priorities[i]
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            child = first
+            for candidate in range(first + 1, min(first + arity, size)):
+                if priorities[candidate] < priorities[child]:
+                    child = candidate
+            if not priorities[child] < priority:
+                break
+            items[i], priorities[i] = items[child], priorities[child]
+            position[items[i]] = i
+            i = child
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+
+class PairingNode:
+    __slots__ = ("item", "priority", "child", "sibling", "previous")
+
+    def __init__(self, item, priority):
+        self.item = item
+        self.priority = priority
+        self.child: Optional["PairingNode"] = None  # The leftmost child
+        self.sibling: Optional["PairingNode"] = None  # The next sibling to the right
+        self.previous: Optional["PairingNode"] = None  # The left sibling, or the parent for a leftmost child
+
+
+class PairingHeap:
+    """A pairing heap: a heap-ordered tree in which any number of children hang off each node.
+
+    insert, meld and decrease_key only link two trees, in O(1); extract_min pairs up the root's children and
+    links the pairs, in amortized O(log n). A dictionary from item to node lets items be changed or removed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty pairing heap.
+        """
+        self.root: Optional[PairingNode] = None
+        self.nodes: Dict[Hashable, PairingNode] = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, item):
+        return item in self.nodes
+
+    @staticmethod
+    def _link(a: Optional[PairingNode], b: Optional[PairingNode]) -> Optional[PairingNode]:
+        """
+        Link two trees, making the root with the larger priority the leftmost child of the other.
+
+        :param a: The root of the first tree, which must have no siblings.
+        :param b: The root of the second tree, which must have no siblings.
+        :return: The root of the linked tree.
+        """
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.priority < a.priority:
+            a, b = b, a
+        b.previous = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.previous = b
+        a.child = b
+        return a
+
+    def _merge_pairs(self, first: Optional[PairingNode]) -> Optional[PairingNode]:
+        """
+        Combine a list of siblings into one tree: link them in pairs from left to right, then link the pairs from
+        right to left.
+
+        :param first: The leftmost sibling.
+        :return: The root of the combined tree.
+        """
+        pairs = []
+        while first is not None:
+            a, b = first, first.sibling
+            first = b.sibling if b is not None else None
+            a.sibling = a.previous = None
+            if b is not None:
+                b.sibling = b.previous = None
+            pairs.append(self._link(a, b))
+        root = pairs.pop() if pairs else None
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def _cut(self, node: PairingNode):
+        """
+        Detach a node, together with its subtree, from its parent and siblings.
+
+        :param node: A node other than the root.
+        """
+        if node.previous.child is node:
+            node.previous.child = node.sibling
+        else:
+            node.previous.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.previous = node.previous
+        node.previous = node.sibling = None
+
+    def insert(self, item, priority):
+        """
+        Insert an item that is not in the heap yet.
+
+        :param item: The item to be inserted.
+        :param priority: Its priority; smaller priorities come out first.
+        """
+        if item in self.nodes:
+            raise ValueError(f"Item {item!r} is already in the queue.")
+        node = self.nodes[item] = PairingNode(item, priority)
+        self.root = self._link(self.root, node)
 
-        :return: True if the max-heap is empty, otherwise False.
+    def update(self, item, priority):
         """
-        return len(self.max_heap) == 0
+        Insert an item, or change its priority if it is already in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority.
+        """
+        node = self.nodes.get(item)
+        if node is None:
+            self.insert(item, priority)
+        elif priority < node.priority:
+            self.decrease_key(item, priority)
+        else:
+            self.increase_key(item, priority)
+
+    def decrease_key(self, item, priority):
+        """
+        Lower the priority of an item in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be greater than the current one.
+        """
+        node = self.nodes[item]
+        if node.priority < priority:
+            raise ValueError(f"New priority {priority!r} is greater than the current one.")
+        node.priority = priority
+        if node is not self.root:
+            self._cut(node)
+            self.root = self._link(self.root, node)
+
+    def increase_key(self, item, priority):
+        """
+        Raise the priority of an item in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be less than the current one.
+        """
+        if priority < self.nodes[item].priority:
+            raise ValueError(f"New priority {priority!r} is less than the current one.")
+        self.remove(item)
+        self.insert(item, priority)
+
+    def remove(self, item):
+        """
+        Remove an item from the heap.
+
+        :param item: The item to be removed.
+        :return: The item's priority.
+        """
+        node = self.nodes.pop(item)
+        if node is self.root:
+            self.root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            self.root = self._link(self.root, self._merge_pairs(node.child))
+        node.child = None
+        return node.priority
+
+    def get_min(self) -> Tuple[Any, Any]:
+        """
+        Get the item with the smallest priority without removing it.
+
+        :return: The item and its priority.
+        """
+        if self.root is None:
+            raise IndexError("Priority queue is empty.")
+        return self.root.item, self.root.priority
+
+    def extract_min(self) -> Tuple[Any, Any]:
+        """
+        Extract and return the item with the smallest priority.
+
+        :return: The item and its priority.
+        """
+        if self.root is None:
+            raise IndexError("Priority queue is empty.")
+        item = self.root.item
+        return item, self.remove(item)
+
+    def meld(self, other: "PairingHeap"):
+        """
+        Move every item of another pairing heap into this one, leaving the other heap empty.
+
+        The trees are linked in O(1); the smaller item index is copied into the larger one.
+
+        :param other: A heap with no items in common with this one.
+        """
+        small, large = sorted((self.nodes, other.nodes), key=len)
+        if any(item in large for item in small):
+            raise ValueError("The heaps have items in common.")
+        large.update(small)
+        self.nodes = large
+        self.root = self._link(self.root, other.root)
+        other.root, other.nodes = None, {}
+
+
+class RadixHeap:
+    """A monotone priority queue for non-negative integer priorities, as in Dijkstra's algorithm with integer
+    distances or an event simulation: no item may be given a priority below the last one extracted.
+
+    Items are kept in buckets by the highest bit in which their priority differs from the last extracted one.
+    Bucket 0 holds the items whose priority equals it. When bucket 0 is empty, the first non-empty bucket is
+    emptied into lower buckets relative to its minimum, and every item moves down at most once per bit, for
+    amortized O(log C) per item, where C is the largest priority.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty radix heap.
+        """
+        self.buckets: List[Dict[Hashable, int]] = [{}]
+        self.bucket_of: Dict[Hashable, int] = {}
+        self.last = 0
+
+    def __len__(self):
+        return len(self.bucket_of)
+
+    def __contains__(self, item):
+        return item in self.bucket_of
+
+    def _check(self, priority: int):
+        """
+        Reject a priority below the last extracted one, which the buckets cannot hold.
+
+        :param priority: The priority to check.
+        """
+        if priority < self.last:
+            raise ValueError(f"Priority {priority!r} is below the last extracted priority {self.last!r}.")
+
+    def _place(self, item, priority: int):
+        """
+        Put an item into the bucket its priority belongs to.
+
+        :param item: The item.
+        :param priority: Its priority, no less than the last extracted priority.
+        """
+        bucket = (priority ^ self.last).bit_length()
+        while len(self.buckets) <= bucket:
+            self.buckets.append({})
+        self.buckets[bucket][item] = priority
+        self.bucket_of[item] = bucket
+
+    def insert(self, item, priority: int):
+        """
+        Insert an item that is not in the heap yet.
+
+        :param item: The item to be inserted.
+        :param priority: Its priority, an integer no less than the last extracted priority.
+        """
+        if item in self.bucket_of:
+            raise ValueError(f"Item {item!r} is already in the queue.")
+        self._check(priority)
+        self._place(item, priority)
+
+    def update(self, item, priority: int):
+        """
+        Insert an item, or change its priority if it is already in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority, an integer no less than the last extracted priority.
+        """
+        self._check(priority)  # Before the removal, so a rejected update leaves the item where it was
+        if item in self.bucket_of:
+            self.remove(item)
+        self._place(item, priority)
+
+    def decrease_key(self, item, priority: int):
+        """
+        Lower the priority of an item in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be greater than the current one.
+        """
+        if self.get_priority(item) < priority:
+            raise ValueError(f"New priority {priority!r} is greater than the current one.")
+        self.update(item, priority)
+
+    def increase_key(self, item, priority: int):
+        """
+        Raise the priority of an item in the heap.
+
+        :param item: The item.
+        :param priority: Its new priority, which must not be less than the current one.
+        """
+        if priority < self.get_priority(item):
+            raise ValueError(f"New priority {priority!r} is less than the current one.")
+        self.update(item, priority)
+
+    def get_priority(self, item) -> int:
+        """
+        Get the priority of an item in the heap.
+
+        :param item: The item.
+        :return: Its priority.
+        """
+        return self.buckets[self.bucket_of[item]][item]
+
+    def remove(self, item) -> int:
+        """
+        Remove an item from the heap.
+
+        :param item: The item to be removed.
+        :return: The item's priority.
+        """
+        return self.buckets[self.bucket_of.pop(item)].pop(item)
+
+    def _settle(self) -> Dict[Hashable, int]:
+        """
+        Make sure bucket 0 holds the items with the smallest priority, redistributing a bucket if needed.
+
+        This moves the base of the buckets up to that priority, so it is only done right before it is extracted.
+
+        :return: Bucket 0.
+        """
+        buckets = self.buckets
+        if not buckets[0]:
+            if not self.bucket_of:
+                raise IndexError("Priority queue is empty.")
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = {}
+            self.last = min(bucket.values())
+            for item, priority in bucket.items():
+                self._place(item, priority)
+        return buckets[0]
+
+    def get_min(self) -> Tuple[Any, int]:
+        """
+        Get an item with the smallest priority without removing it.
+
+        The buckets are left as they are, so items may still be inserted below the returned priority; when bucket 0
+        is empty, this scans the first non-empty bucket.
+
+        :return: The item and its priority.
+        """
+        buckets = self.buckets
+        if buckets[0]:
+            return next(iter(buckets[0].items()))
+        if not self.bucket_of:
+            raise IndexError("Priority queue is empty.")
+        i = 1
+        while not buckets[i]:
+            i += 1
+        return min(buckets[i].items(), key=lambda entry: entry[1])
+
+    def extract_min(self) -> Tuple[Any, int]:
+        """
+        Extract and return an item with the smallest priority.
+
+        :return: The item and its priority.
+        """
+        item, priority = self._settle().popitem()
+        del self.bucket_of[item]
+        return item, priority
+
+
+def _dijkstra_workload(make_queue: Callable[[], PriorityQueue], graph: List[List[Tuple[int, int]]]) -> int:
+    """
+    Run Dijkstra's algorithm from node 0, changing queued distances in place.
+
+    :param make_queue: Creates an empty priority queue.
+    :param graph: The (neighbor, integer weight) edges of every node.
+    :return: The sum of all distances, to check that the engines agree.
+    """
+    queue = make_queue()
+    queue.insert(0, 0)
+    distances = {0: 0}
+    settled = set()
+    while queue:
+        node, distance = queue.extract_min()
+        settled.add(node)
+        for neighbor, weight in graph[node]:
+            if neighbor not in settled and distance + weight < distances.get(neighbor, distance + weight + 1):
+                distances[neighbor] = distance + weight
+                queue.update(neighbor, distance + weight)
+    return sum(distances.values())
+
+
+def _event_workload(make_queue: Callable[[], PriorityQueue], delays: List[int], pending: int) -> int:
+    """
+    Simulate events: keep `pending` events queued, and replace each event that comes out with one scheduled a
+    random delay after it (the "hold" model).
+
+    :param make_queue: Creates an empty priority queue.
+    :param delays: The delay of every event after the first `pending` ones.
+    :param pending: How many events are queued at any time.
+    :return: The time of the last event, to check that the engines agree.
+    """
+    queue = make_queue()
+    for event in range(pending):
+        queue.insert(event, delays[event])
+    now = 0
+    for event in range(pending, len(delays)):
+        _, now = queue.extract_min()
+        queue.insert(event, now + delays[event])
+    return now
+
+
+def _sort_workload(make_queue: Callable[[], PriorityQueue], priorities: List[int]) -> int:
+    """
+    Insert everything, then extract everything.
+
+    :param make_queue: Creates an empty priority queue.
+    :param priorities: The priorities to sort.
+    :return: A checksum of the extraction order.
+    """
+    queue = make_queue()
+    for item, priority in enumerate(priorities):
+        queue.insert(item, priority)
+    checksum = 0
+    for position in range(len(priorities)):
+        checksum += position * queue.extract_min()[1]
+    return checksum
+
+
+def benchmark_priority_queues(n: int = 10000, engines: Optional[Dict[str, Callable[[], PriorityQueue]]] = None,
+                              seed: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    Time every priority queue engine on every workload, with the same random data for each engine.
+
+    Workloads: "dijkstra" (a graph with n nodes and 4n edges, mostly decrease-key), "events" (n / 10 pending events
+    and 4n hold operations, monotone) and "sort" (n inserts, then n extracts). All priorities are non-negative
+    integers, so the radix heap can run every workload.
+
+    :param n: The workload size.
+    :param engines: Named factories of empty queues; by default the binary, 4-ary, 8-ary, pairing and radix heaps.
+    :param seed: The seed for the random data.
+    :return: The seconds taken, by workload and then by engine.
+    """
+    if engines is None:
+        engines = {
+            "binary": IndexedPriorityQueue,
+            "4-ary": lambda: DaryHeap(4),
+            "8-ary": lambda: DaryHeap(8),
+            "pairing": PairingHeap,
+            "radix": RadixHeap,
+        }
+    rng = random.Random(seed)
+    graph = [[(rng.randrange(n), rng.randint(1, 1000)) for _ in range(4)] for _ in range(n)]
+    pending = max(1, n // 10)
+    delays = [rng.randint(0, 1000) for _ in range(4 * n + pending)]
+    priorities = [rng.randrange(1 << 30) for _ in range(n)]
+    workloads = {
+        "dijkstra": lambda make_queue: _dijkstra_workload(make_queue, graph),
+        "events": lambda make_queue: _event_workload(make_queue, delays, pending),
+        "sort": lambda make_queue: _sort_workload(make_queue, priorities),
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    for workload, run in workloads.items():
+        results[workload] = {}
+        answers = set()
+        for name, make_queue in engines.items():
+            start = time.perf_counter()
+            answers.add(run(make_queue))
+            results[workload][name] = time.perf_counter() - start
+        if len(answers) > 1:
+            raise AssertionError(f"The engines disagree on the {workload} workload.")
+    return results
+
+
+class QueueEmpty(Exception):
+    """Raised when a value is requested from an empty queue without waiting, or the wait times out."""
+
+
+class QueueFull(Exception):
+    """Raised when a value is offered to a full queue without waiting, or the wait times out."""
+
+
+class BlockingPriorityQueue:
+    """A MinMaxHeap shared between threads: get() waits for a value and, with a maxsize, put() waits for room.
+
+    Values come out smallest first (by key, if one is given). put_many() and get_many() move a whole batch per
+    lock acquisition and per wake-up, which is where most of the cost goes when many threads share one queue.
+    """
+
+    def __init__(self, maxsize: int = 0, key: Optional[Callable[[Any], Any]] = None):
+        """
+        Initialize an empty queue.
+
+        :param maxsize: The most values the queue holds before put() waits; 0 for no limit.
+        :param key: A function that computes the value's sort key, or None to compare the values directly.
+        """
+        self.maxsize = maxsize
+        self.heap = MinMaxHeap(key)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def qsize(self) -> int:
+        """
+        Get the number of values in the queue.
+
+        :return: The number of values in the queue.
+        """
+        return len(self.heap)
+
+    def empty(self) -> bool:
+        """
+        Check if the queue is empty.
+
+        :return: True if the queue is empty, otherwise False.
+        """
+        return len(self.heap) == 0
+
+    def full(self) -> bool:
+        """
+        Check if the queue holds maxsize values.
+
+        :return: True if put() would have to wait, otherwise False.
+        """
+        return 0 < self.maxsize <= len(self.heap)
+
+    def _room(self) -> int:
+        return self.maxsize - len(self.heap) if self.maxsize > 0 else 1 << 62
+
+    def put(self, value, timeout: Optional[float] = None):
+        """
+        Add a value, waiting for room if the queue is full.
+
+        :param value: The value.
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        """
+        with self.not_full:
+            if not self.not_full.wait_for(self._room, timeout):
+                raise QueueFull("Priority queue is full.")
+            self.heap.insert(value)
+            self.not_empty.notify()
+
+    def put_many(self, values: Iterable, timeout: Optional[float] = None):
+        """
+        Add many values, as many at a time as there is room for.
+
+        :param values: The values.
+        :param timeout: The most seconds to wait for room in total, or None to wait as long as it takes. If it runs
+            out, the values queued so far stay queued.
+        """
+        values = list(values)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        queued = 0
+        with self.not_full:
+            while queued < len(values):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self.not_full.wait_for(self._room, remaining):
+                    raise QueueFull(f"Priority queue is full; {queued} of {len(values)} values were queued.")
+                batch = values[queued:queued + self._room()]
+                self.heap.insert_many(batch)
+                queued += len(batch)
+                self.not_empty.notify(len(batch))
+
+    def put_nowait(self, value):
+        """
+        Add a value if there is room, or raise QueueFull.
+
+        :param value: The value.
+        """
+        self.put(value, timeout=0)
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Remove and return the smallest value, waiting for one if the queue is empty.
+
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        :return: The smallest value.
+        """
+        with self.not_empty:
+            if not self.not_empty.wait_for(self.heap.__len__, timeout):
+                raise QueueEmpty("Priority queue is empty.")
+            value = self.heap.extract_min()
+            self.not_full.notify()
+            return value
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List:
+        """
+        Remove and return up to max_items of the smallest values, waiting until there is at least one.
+
+        :param max_items: The most values to return.
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        :return: The values, smallest first; empty if the wait timed out.
+        """
+        with self.not_empty:
+            if not self.not_empty.wait_for(self.heap.__len__, timeout):
+                return []
+            values = self.heap.extract_many(max_items)
+            self.not_full.notify(len(values))
+            if self.heap.heap:
+                self.not_empty.notify()  # Left over for another waiting consumer
+            return values
+
+    def get_nowait(self):
+        """
+        Remove and return the smallest value, or raise QueueEmpty.
+
+        :return: The smallest value.
+        """
+        return self.get(timeout=0)
+
+
+class AsyncPriorityQueue:
+    """The asyncio counterpart of BlockingPriorityQueue, with the same methods as coroutines (except the
+    *_nowait ones). It is meant for tasks of one event loop and is not thread-safe. With a maxsize, producers
+    wait in put() and put_many() until consumers make room, so a fast producer cannot grow the queue without bound.
+    """
+
+    def __init__(self, maxsize: int = 0, key: Optional[Callable[[Any], Any]] = None):
+        """
+        Initialize an empty queue.
+
+        :param maxsize: The most values the queue holds before put() waits; 0 for no limit.
+        :param key: A function that computes the value's sort key, or None to compare the values directly.
+        """
+        self.maxsize = maxsize
+        self.heap = MinMaxHeap(key)
+        self.getters: Deque = deque()  # Futures of tasks waiting for a value
+        self.putters: Deque = deque()  # Futures of tasks waiting for room
+
+    def __len__(self):
+        return len(self.heap)
+
+    def qsize(self) -> int:
+        """
+        Get the number of values in the queue.
+
+        :return: The number of values in the queue.
+        """
+        return len(self.heap)
+
+    def empty(self) -> bool:
+        """
+        Check if the queue is empty.
+
+        :return: True if the queue is empty, otherwise False.
+        """
+        return len(self.heap) == 0
+
+    def full(self) -> bool:
+        """
+        Check if the queue holds maxsize values.
+
+        :return: True if put() would have to wait, otherwise False.
+        """
+        return 0 < self.maxsize <= len(self.heap)
+
+    def _room(self) -> int:
+        return self.maxsize - len(self.heap) if self.maxsize > 0 else 1 << 62
+
+    @staticmethod
+    def _wake(waiters: Deque, n: int = 1):
+        """
+        Wake up to n waiting tasks.
+
+        :param waiters: The futures of the waiting tasks.
+        :param n: How many to wake.
+        """
+        while waiters and n > 0:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                n -= 1
+
+    async def _wait(self, waiters: Deque, ready: Callable[[], Any], deadline: Optional[float]) -> bool:
+        """
+        Wait until ready() is true or the deadline passes.
+
+        :param waiters: Where to queue this task's future, so that the other side can wake it.
+        :param ready: The condition to wait for.
+        :param deadline: The event loop time to give up at, or None to wait as long as it takes.
+        :return: True if ready() is true, False if the deadline passed first.
+        """
+        # Imported here: this folder's array.py shadows a module asyncio needs when the examples are run as
+        # scripts from inside it. Any task awaiting this has asyncio loaded already.
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while not ready():
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
+                return False
+            future = loop.create_future()
+            waiters.append(future)
+            try:
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                pass
+            except BaseException:
+                if future.done() and not future.cancelled():
+                    self._wake(waiters)  # Pass on a wake-up this task can no longer use
+                raise
+            finally:
+                if not future.done() or future.cancelled():
+                    try:
+                        waiters.remove(future)
+                    except ValueError:
+                        pass
+        return True
+
+    @staticmethod
+    def _deadline(timeout: Optional[float]) -> Optional[float]:
+        if timeout is None:
+            return None
+        import asyncio
+        return asyncio.get_running_loop().time() + timeout
+
+    async def put(self, value, timeout: Optional[float] = None):
+        """
+        Add a value, waiting for room if the queue is full.
+
+        :param value: The value.
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        """
+        if not await self._wait(self.putters, self._room, self._deadline(timeout)):
+            raise QueueFull("Priority queue is full.")
+        self.heap.insert(value)
+        self._wake(self.getters)
+
+    async def put_many(self, values: Iterable, timeout: Optional[float] = None):
+        """
+        Add many values, as many at a time as there is room for.
+
+        :param values: The values.
+        :param timeout: The most seconds to wait for room in total, or None to wait as long as it takes. If it runs
+            out, the values queued so far stay queued.
+        """
+        values = list(values)
+        deadline = self._deadline(timeout)
+        queued = 0
+        while queued < len(values):
+            if not await self._wait(self.putters, self._room, deadline):
+                raise QueueFull(f"Priority queue is full; {queued} of {len(values)} values were queued.")
+            batch = values[queued:queued + self._room()]
+            self.heap.insert_many(batch)
+            queued += len(batch)
+            self._wake(self.getters, len(batch))
+
+    def put_nowait(self, value):
+        """
+        Add a value if there is room, or raise QueueFull.
+
+        :param value: The value.
+        """
+        if not self._room():
+            raise QueueFull("Priority queue is full.")
+        self.heap.insert(value)
+        self._wake(self.getters)
+
+    async def get(self, timeout: Optional[float] = None):
+        """
+        Remove and return the smallest value, waiting for one if the queue is empty.
+
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        :return: The smallest value.
+        """
+        if not await self._wait(self.getters, self.heap.__len__, self._deadline(timeout)):
+            raise QueueEmpty("Priority queue is empty.")
+        return self.get_nowait()
+
+    async def get_many(self, max_items: int, timeout: Optional[float] = None) -> List:
+        """
+        Remove and return up to max_items of the smallest values, waiting until there is at least one.
+
+        :param max_items: The most values to return.
+        :param timeout: The most seconds to wait, or None to wait as long as it takes.
+        :return: The values, smallest first; empty if the wait timed out.
+        """
+        if not await self._wait(self.getters, self.heap.__len__, self._deadline(timeout)):
+            return []
+        values = self.heap.extract_many(max_items)
+        self._wake(self.putters, len(values))
+        if self.heap.heap:
+            self._wake(self.getters)
+        return values
+
+    def get_nowait(self):
+        """
+        Remove and return the smallest value, or raise QueueEmpty.
+
+        :return: The smallest value.
+        """
+        if not self.heap.heap:
+            raise QueueEmpty("Priority queue is empty.")
+        value = self.heap.extract_min()
+        self._wake(self.putters)
+        return value
+
+
+def benchmark_contention(workers: Iterable[int] = (1, 2, 4, 8, 16, 32), items: int = 100000,
+                         batch_sizes: Iterable[int] = (1, 64), maxsize: int = 1024) -> Dict[Tuple[int, int], float]:
+    """
+    Measure the throughput of a BlockingPriorityQueue shared by equal numbers of producer and consumer threads.
+
+    With a batch size of 1 every value is moved with put() and get(); with larger ones, with put_many() and
+    get_many().
+
+    :param workers: The numbers of producers (and, equally, consumers) to try.
+    :param items: The number of values moved per run.
+    :param batch_sizes: The batch sizes to try.
+    :param maxsize: The capacity of the queue, so producers also have to wait for consumers.
+    :return: Values per second, by (workers, batch size).
+    """
+    results: Dict[Tuple[int, int], float] = {}
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(items)]
+    for worker_count in workers:
+        for batch in batch_sizes:
+            queue = BlockingPriorityQueue(maxsize)
+            shares = [values[i::worker_count] for i in range(worker_count)]
+
+            def produce(share: List[float]):
+                if batch == 1:
+                    for value in share:
+                        queue.put(value)
+                else:
+                    for start in range(0, len(share), batch):
+                        queue.put_many(share[start:start + batch])
+                queue.put(float("inf"))  # Sorts after every value; one stop signal per consumer
+
+            def consume():
+                while True:
+                    got = [queue.get()] if batch == 1 else queue.get_many(batch)
+                    stops = got.count(float("inf"))
+                    if stops:
+                        for _ in range(stops - 1):
+                            queue.put(float("inf"))  # Hand the other consumers their stop signals back
+                        return
+
+            threads = [threading.Thread(target=produce, args=(share,)) for share in shares]
+            threads += [threading.Thread(target=consume) for _ in range(worker_count)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results[(worker_count, batch)] = items / (time.perf_counter() - start)
+    return results
+
 
 # Example usage:
 min_max_heap = MinMaxHeap()
@@ -101,10 +1645,72 @@ min_max_heap.insert(3)
 min_max_heap.insert(8)
 min_max_heap.insert(1)
 
+print("Min and max:", min_max_heap.get_min(), min_max_heap.get_max())  # Output: 1 8
+
 print("Min-Heap:")
-while not min_max_heap.is_empty_min():
-    print(min_max_heap.extract_min())
+print(min_max_heap.extract_min())
+print(min_max_heap.extract_min())
 
 print("Max-Heap:")
 while not min_max_heap.is_empty_max():
-    print(min_max_heap.extract_max())
+    print(min_max_heap.extract_max())  # Only 8 and 5 are left: each value is removed from both ends at once
+
+# Values that cannot be negated, ordered by a key function
+flights_by_departure = MinMaxHeap(key=lambda flight: flight[1])
+for flight in [("BA117", "18:30"), ("AA100", "09:15"), ("DL44", "13:05")]:
+    flights_by_departure.insert(flight)
+print("First and last departure:", flights_by_departure.extract_min(), flights_by_departure.extract_max())
+
+# One array against the original two heaps; pass a larger n, such as the default 10 ** 6, for stable numbers
+for measure, by_heap in benchmark_min_max_heap(20000).items():
+    unit, scale = ("KiB", 1 / 1024) if measure == "memory" else ("ms", 1000)
+    print(f"{measure:>7}:", ", ".join(f"{name} {amount * scale:.1f} {unit}" for name, amount in by_heap.items()))
+
+# Changing priorities in place instead of queueing duplicates
+jobs = IndexedPriorityQueue()
+for job, priority in [("backup", 5), ("report", 3), ("deploy", 8)]:
+    jobs.insert(job, priority)
+jobs.decrease_key("deploy", 1)
+jobs.increase_key("report", 9)
+jobs.remove("backup")
+print("Next jobs:", jobs.extract_min(), jobs.extract_min(), len(jobs))  # Output: ('deploy', 1) ('report', 9) 0
+
+# A radix heap only refuses priorities below the last extracted one, and a refused update keeps the item queued
+events = RadixHeap()
+events.insert("a", 10)
+events.insert("b", 20)
+print("Radix peek:", events.get_min())  # Output: ('a', 10)
+events.insert("c", 5)  # Still allowed: peeking extracts nothing
+print("Radix extract:", events.extract_min(), events.extract_min())  # Output: ('c', 5) ('a', 10)
+try:
+    events.decrease_key("b", 5)
+except ValueError as error:
+    print("Rejected:", error)
+print("Still queued:", "b" in events, events.get_min())  # Output: True ('b', 20)
+
+# Building a heap in one pass, and keeping the best values of a long stream
+bulk_heap = MinMaxHeap.from_iterable([7, 2, 9, 4, 1, 8])
+bulk_heap.insert_many([6, 3])
+print("Three smallest:", bulk_heap.extract_many(3), "two largest:", bulk_heap.extract_many(2, largest=True))
+print("Merged:", list(merge_sorted([1, 4, 9], [2, 3, 10], [5])))
+top_three = TopK(3)
+top_three.add_many(x * 37 % 101 for x in range(101))
+print("Top three:", top_three.items())  # Output: [100, 99, 98]
+for operation, timings in benchmark_bulk_operations(20000, 10, 4).items():  # The default is a 10 ** 7 stream
+    print(f"{operation:>5}:", ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+
+# The same workloads on every engine; pass a larger n to pick an engine for real use
+for workload, timings in benchmark_priority_queues(2000).items():
+    print(f"{workload:>8}:", ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+
+# Producer and consumer threads sharing one bounded priority queue
+shared_queue = BlockingPriorityQueue(maxsize=8)
+producer = threading.Thread(target=shared_queue.put_many, args=([5, 1, 9, 3, 7, 2, 8, 6, 4],))
+producer.start()
+received = []
+while len(received) < 9:
+    received.extend(shared_queue.get_many(4, timeout=1))
+producer.join()
+print("Received:", len(received), "values; queue empty:", shared_queue.empty())
+for (worker_count, batch), rate in benchmark_contention((1, 4), 2000).items():
+    print(f"{worker_count} producers/consumers, batch {batch}: {rate:,.0f} values/s")
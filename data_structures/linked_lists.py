@@ -19,18 +19,37 @@ doesn't require shifting elements. However, random access can be slower as you n
 beginning to reach a specific element. Linked lists can be more flexible in terms of data structure, and they can be
 used to implement more complex data structures like stacks and queues."""
 
-from typing import Any
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+import random
+import time
 
 
 class Node:
+    __slots__ = ("data", "next")  # No per-instance __dict__, which matters with millions of nodes
+
     def __init__(self, data: Any):
         self.data = data
         self.next = None
 
 
 class LinkedList:
-    def __init__(self):
+    def __init__(self, iterable: Optional[Iterable[Any]] = None):
         self.head = None
+        self.tail = None  # Last node, so append does not have to walk the list
+        self.size = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
 
     def is_empty(self) -> bool:
         return self.head is None
@@ -39,16 +58,71 @@ class LinkedList:
         new_node = Node(data)
         if self.head is None:
             self.head = new_node
-            return
-        current = self.head
-        while current.next:
-            current = current.next
-        current.next = new_node
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
 
     def prepend(self, data: Any) -> None:
         new_node = Node(data)
         new_node.next = self.head
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self.size += 1
+
+    def extend(self, iterable: Iterable[Any]) -> None:
+        # Link the new nodes locally and touch the list attributes only once at the end.
+        iterator = iter(iterable)
+        for data in iterator:
+            first = last = Node(data)
+            break
+        else:
+            return
+        count = 1
+        for data in iterator:
+            node = Node(data)
+            last.next = node
+            last = node
+            count += 1
+        if self.head is None:
+            self.head = first
+        else:
+            self.tail.next = first
+        self.tail = last
+        self.size += count
+
+    def concat(self, other: "LinkedList") -> None:
+        # Move all nodes of `other` to the end of this list in O(1); `other` is left empty.
+        if other is self or other.head is None:
+            return
+        if self.head is None:
+            self.head = other.head
+        else:
+            self.tail.next = other.head
+        self.tail = other.tail
+        self.size += other.size
+        other.head = other.tail = None
+        other.size = 0
+
+    def splice(self, after: Optional[Node], other: "LinkedList") -> None:
+        # Insert all nodes of `other` right after the node `after` (or at the front when `after` is None)
+        # in O(1); `other` is left empty.
+        if other is self or other.head is None:
+            return
+        if after is None:
+            other.tail.next = self.head
+            self.head = other.head
+            if self.tail is None:
+                self.tail = other.tail
+        else:
+            other.tail.next = after.next
+            after.next = other.head
+            if after is self.tail:
+                self.tail = other.tail
+        self.size += other.size
+        other.head = other.tail = None
+        other.size = 0
 
     def delete(self, data: Any) -> None:
         if self.head is None:
@@ -56,22 +130,63 @@ class LinkedList:
 
         if self.head.data == data:
             self.head = self.head.next
+            if self.head is None:
+                self.tail = None
+            self.size -= 1
             return
 
         current = self.head
         while current.next:
             if current.next.data == data:
+                if current.next is self.tail:
+                    self.tail = current
                 current.next = current.next.next
+                self.size -= 1
                 return
             current = current.next
 
     def display(self) -> None:
-        elements = []
-        current = self.head
-        while current:
-            elements.append(current.data)
-            current = current.next
-        print(" -> ".join(map(str, elements)))
+        print(" -> ".join(map(str, self)))
+
+
+def _append_by_walking(head: Optional[Node], data: Any) -> Node:
+    # The append LinkedList used before it kept a tail: walk to the last node on every call. Returns the head.
+    new_node = Node(data)
+    if head is None:
+        return new_node
+    current = head
+    while current.next:
+        current = current.next
+    current.next = new_node
+    return head
+
+
+def benchmark_append(sizes: Iterable[int] = (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7),
+                     walk_limit: int = 10 ** 4) -> Dict[int, Dict[str, float]]:
+    """Time building a list of each size one append at a time.
+
+    "tail" is LinkedList.append, "extend" is one LinkedList.extend call and "walk" is the old append that walked
+    from the head on every call. The walk is O(n^2) in total, so it is only timed for sizes up to walk_limit.
+    Returns the seconds taken, by size and then by method.
+    """
+    results: Dict[int, Dict[str, float]] = {}
+    for size in sizes:
+        results[size] = {}
+        start = time.perf_counter()
+        linked_list = LinkedList()
+        for i in range(size):
+            linked_list.append(i)
+        results[size]["tail"] = time.perf_counter() - start
+        start = time.perf_counter()
+        LinkedList().extend(range(size))
+        results[size]["extend"] = time.perf_counter() - start
+        if size <= walk_limit:
+            start = time.perf_counter()
+            head = None
+            for i in range(size):
+                head = _append_by_walking(head, i)
+            results[size]["walk"] = time.perf_counter() - start
+    return results
 
 
 # Example usage:
@@ -91,6 +206,216 @@ linked_list.delete(2)
 
 linked_list.display()  # Output: 0 -> 1 -> 3
 
+linked_list.extend([4, 5])
+linked_list.concat(LinkedList([6, 7]))
+
+linked_list.display()  # Output: 0 -> 1 -> 3 -> 4 -> 5 -> 6 -> 7
+print(len(linked_list))  # Output: 7
+
+# Pass larger sizes, up to the default 10 ** 7, to measure real ingestion volumes
+for size, timings in benchmark_append((1000, 100000), walk_limit=1000).items():
+    print(f"{size:>7} appends:", ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+
+
+# =================================================== Unrolled Linked List ====================================
+
+"""An unrolled linked list stores a small Python list (a chunk) in every node instead of a single element. Walking
+the list follows one pointer per chunk rather than per element and the elements of a chunk sit next to each other,
+so iteration and indexing are much faster than in LinkedList while inserts in the middle still only shift one
+chunk. A full chunk is split in two halves, which keeps appends O(1) amortized."""
+
+
+class UnrolledNode:
+    __slots__ = ("items", "next")
+
+    def __init__(self, items: Optional[List[Any]] = None):
+        self.items = items if items is not None else []
+        self.next = None
+
+
+class UnrolledLinkedList:
+    def __init__(self, iterable: Optional[Iterable[Any]] = None, chunk_size: int = 64):
+        if chunk_size < 2:
+            raise ValueError("Chunk size must be at least 2.")
+        self.chunk_size = chunk_size
+        self.head = self.tail = UnrolledNode()
+        self.size = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        current = self.head
+        while current:
+            yield from current.items
+            current = current.next
+
+    def is_empty(self) -> bool:
+        return self.size == 0
+
+    def _locate(self, index: int) -> Tuple[UnrolledNode, int]:
+        # Return the node holding position `index` and the offset inside its chunk.
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Index out of range.")
+        if index >= self.size - len(self.tail.items):
+            return self.tail, index - (self.size - len(self.tail.items))
+        current = self.head
+        while index >= len(current.items):
+            index -= len(current.items)
+            current = current.next
+        return current, index
+
+    def _split(self, node: UnrolledNode) -> None:
+        half = len(node.items) // 2
+        new_node = UnrolledNode(node.items[half:])
+        del node.items[half:]
+        new_node.next = node.next
+        node.next = new_node
+        if node is self.tail:
+            self.tail = new_node
+
+    def append(self, data: Any) -> None:
+        if len(self.tail.items) >= self.chunk_size:
+            self._split(self.tail)
+        self.tail.items.append(data)
+        self.size += 1
+
+    def extend(self, iterable: Iterable[Any]) -> None:
+        for data in iterable:
+            self.append(data)
+
+    def insert(self, index: int, data: Any) -> None:
+        # Out-of-range indices are clamped to the ends, as with list.insert.
+        if index < 0:
+            index = max(index + self.size, 0)
+        if index >= self.size:
+            self.append(data)
+            return
+        node, offset = self._locate(index)
+        node.items.insert(offset, data)
+        self.size += 1
+        if len(node.items) > self.chunk_size:
+            self._split(node)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.iter_slice(*index.indices(self.size)))
+        node, offset = self._locate(index)
+        return node.items[offset]
+
+    def __setitem__(self, index: int, data: Any) -> None:
+        node, offset = self._locate(index)
+        node.items[offset] = data
+
+    def iter_slice(self, start: int, stop: int, step: int = 1) -> Iterator[Any]:
+        # Skip whole chunks to reach `start`, then slice chunk by chunk.
+        if step < 0:
+            items = list(self)
+            for index in range(start, stop, step):
+                yield items[index]
+            return
+        current = self.head
+        while current and start >= len(current.items):
+            start -= len(current.items)
+            stop -= len(current.items)
+            current = current.next
+        while current and stop > 0:
+            chunk = current.items
+            if start < len(chunk):
+                yield from chunk[start:stop:step]
+                start += -(-(len(chunk) - start) // step) * step  # First position past this chunk
+            start -= len(chunk)
+            stop -= len(chunk)
+            current = current.next
+
+    def delete(self, data: Any) -> None:
+        previous = None
+        current = self.head
+        while current:
+            if data in current.items:
+                current.items.remove(data)
+                self.size -= 1
+                if not current.items and previous is not None:
+                    # Drop empty chunks, but always keep the head chunk around.
+                    previous.next = current.next
+                    if current is self.tail:
+                        self.tail = previous
+                return
+            previous = current
+            current = current.next
+
+    def display(self) -> None:
+        print(" -> ".join(map(str, self)))
+
+
+def _linked_list_insert(linked_list: LinkedList, index: int, data: Any) -> None:
+    # LinkedList has no indexed insert: walk to the node before `index` and splice a one-node list after it.
+    after = None
+    if index > 0:
+        after = linked_list.head
+        for _ in range(index - 1):
+            after = after.next
+    linked_list.splice(after, LinkedList([data]))
+
+
+def benchmark_unrolled(n: int = 10000, operations: int = 1000, chunk_size: int = 64,
+                       seed: int = 1) -> Dict[str, Dict[str, float]]:
+    """Time UnrolledLinkedList against LinkedList and list on n items.
+
+    "iterate" walks all items once, "get" reads `operations` random indices and "insert" inserts `operations`
+    items in the middle. LinkedList has no indexing, so its gets walk with islice and its inserts walk to the
+    middle node. Returns the seconds taken, by operation and then by structure.
+    """
+    rng = random.Random(seed)
+    indices = [rng.randrange(n) for _ in range(operations)]
+    structures = {
+        "unrolled": UnrolledLinkedList(range(n), chunk_size),
+        "linked": LinkedList(range(n)),
+        "list": list(range(n)),
+    }
+    getters = {
+        "unrolled": lambda items, index: items[index],
+        "linked": lambda items, index: next(islice(items, index, None)),
+        "list": lambda items, index: items[index],
+    }
+    inserters = {
+        "unrolled": UnrolledLinkedList.insert,
+        "linked": _linked_list_insert,
+        "list": list.insert,
+    }
+    results: Dict[str, Dict[str, float]] = {"iterate": {}, "get": {}, "insert": {}}
+    for name, items in structures.items():
+        start = time.perf_counter()
+        for _ in items:
+            pass
+        results["iterate"][name] = time.perf_counter() - start
+        get = getters[name]
+        start = time.perf_counter()
+        for index in indices:
+            get(items, index)
+        results["get"][name] = time.perf_counter() - start
+        insert = inserters[name]
+        start = time.perf_counter()
+        for i in range(operations):
+            insert(items, len(items) // 2, i)
+        results["insert"][name] = time.perf_counter() - start
+    return results
+
+
+unrolled_list = UnrolledLinkedList(range(10), chunk_size=4)
+
+unrolled_list.insert(5, 99)
+unrolled_list.delete(2)
+
+unrolled_list.display()  # Output: 0 -> 1 -> 3 -> 4 -> 99 -> 5 -> 6 -> 7 -> 8 -> 9
+print(unrolled_list[4], unrolled_list[2:6])  # Output: 99 [3, 4, 99, 5]
+for operation, timings in benchmark_unrolled(2000, 200).items():
+    print(f"{operation:>7}:", ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+
 
 # =================================================== Circular Linked List ====================================
 
@@ -99,6 +424,8 @@ elements, similar to a regular linked list. The key difference is that in a circ
 the list does not point to a null or None reference; instead, it points back to the first element, creating a closed 
 loop or cycle."""
 class CircularNode:
+    __slots__ = ("data", "next")
+
     def __init__(self, data: Any):
         self.data = data
         self.next = None
@@ -106,72 +433,148 @@ class CircularNode:
 class CircularLinkedList:
     def __init__(self):
         self.head = None
+        self.tail = None  # Node before head, so both ends can be reached without walking the ring
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        current = self.head
+        for _ in range(self.size):
+            yield current.data
+            current = current.next
 
     def is_empty(self) -> bool:
         return self.head is None
 
     def append(self, data: Any) -> None:
-        new_node = CircularNode(data)  # Updated the class name here
+        new_node = CircularNode(data)
         if self.head is None:
+            new_node.next = new_node
             self.head = new_node
-            self.head.next = self.head
         else:
-            current = self.head
-            while current.next != self.head:
-                current = current.next
-            current.next = new_node
             new_node.next = self.head
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
 
     def prepend(self, data: Any) -> None:
         new_node = CircularNode(data)
         if self.head is None:
             new_node.next = new_node
-            self.head = new_node
+            self.tail = new_node
         else:
             new_node.next = self.head
-            current = self.head
-            while current.next != self.head:
-                current = current.next
-            current.next = new_node
-            self.head = new_node
+            self.tail.next = new_node
+        self.head = new_node
+        self.size += 1
 
     def delete(self, data: Any) -> None:
         if self.head is None:
             return
 
-        if self.head.data == data:
-            if self.head.next == self.head:
-                self.head = None
-            else:
-                current = self.head
-                while current.next != self.head:
-                    current = current.next
-                current.next = self.head.next
-                self.head = self.head.next
-            return
-
+        prev = self.tail
         current = self.head
-        prev = None
-        while current.next != self.head:
+        for _ in range(self.size):
             if current.data == data:
-                prev.next = current.next
+                if self.size == 1:
+                    self.head = self.tail = None
+                else:
+                    prev.next = current.next
+                    if current is self.head:
+                        self.head = current.next
+                    if current is self.tail:
+                        self.tail = prev
+                self.size -= 1
                 return
             prev = current
             current = current.next
 
-    def display(self) -> None:
+    def current(self) -> Any:
         if self.head is None:
+            raise IndexError("Circular linked list is empty.")
+        return self.head.data
+
+    def advance(self) -> Any:
+        # Return the current item and make the next one current.
+        data = self.current()
+        self.tail = self.head
+        self.head = self.head.next
+        return data
+
+    def rotate(self, k: int = 1) -> None:
+        # Move the head k steps forward; negative k moves it backward.
+        if self.size < 2:
             return
+        for _ in range(k % self.size):
+            self.tail = self.head
+            self.head = self.head.next
 
-        elements = []
-        current = self.head
-        while True:
-            elements.append(current.data)
-            current = current.next
-            if current == self.head:
-                break
+    def remove_current(self) -> Any:
+        # Remove the current item in O(1); the next item becomes current.
+        data = self.current()
+        if self.size == 1:
+            self.head = self.tail = None
+        else:
+            self.head = self.head.next
+            self.tail.next = self.head
+        self.size -= 1
+        return data
+
+    def round_robin(self) -> Iterator[Any]:
+        """Yield items in ring order forever, or until the ring becomes empty.
+
+        Items may be appended, prepended, deleted or removed with remove_current while the iterator is in use; if
+        the item just yielded was removed, the iterator continues with whichever item took its place.
+        """
+        while self.head is not None:
+            node = self.head
+            yield node.data
+            if self.head is node:
+                self.tail = node
+                self.head = node.next
 
-        print(" -> ".join(map(str, elements)))
+    def display(self) -> None:
+        if self.head is None:
+            return
+
+        print(" -> ".join(map(str, self)))
+
+
+def benchmark_rotation(size: int = 1000, steps: int = 10 ** 6) -> Dict[str, float]:
+    """Time moving the head of a ring of size items forward steps times.
+
+    "advance" and "rotate_1" take one step per call, "rotate_k" takes all steps in one rotate call,
+    "round_robin" draws steps items from the iterator, and "deque" is collections.deque.rotate(-1) per step.
+    Returns the seconds taken, by method.
+    """
+    ring = CircularLinkedList()
+    for i in range(size):
+        ring.append(i)
+    results: Dict[str, float] = {}
+    start = time.perf_counter()
+    for _ in range(steps):
+        ring.advance()
+    results["advance"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(steps):
+        ring.rotate(1)
+    results["rotate_1"] = time.perf_counter() - start
+    start = time.perf_counter()
+    ring.rotate(steps)
+    results["rotate_k"] = time.perf_counter() - start
+    start = time.perf_counter()
+    workers = ring.round_robin()
+    for _ in range(steps):
+        next(workers)
+    results["round_robin"] = time.perf_counter() - start
+    baseline = deque(range(size))
+    start = time.perf_counter()
+    for _ in range(steps):
+        baseline.rotate(-1)
+    results["deque"] = time.perf_counter() - start
+    return results
 
 
 circular_linked_list = CircularLinkedList()
@@ -189,3 +592,319 @@ circular_linked_list.display()  # Output: 0 -> 1 -> 2 -> 3
 circular_linked_list.delete(2)
 
 circular_linked_list.display()  # Output: 0 -> 1 -> 3
+
+circular_linked_list.rotate(2)
+
+circular_linked_list.display()  # Output: 3 -> 0 -> 1
+
+workers = circular_linked_list.round_robin()
+print([next(workers) for _ in range(5)])  # Output: [3, 0, 1, 3, 0]
+rotation_timings = benchmark_rotation(100, 10000)  # The default is a million steps
+print("Rotation:", ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in rotation_timings.items()))
+
+
+# =================================================== Compact Linked List =====================================
+
+"""A compact linked list keeps its nodes in parallel arrays instead of separate objects: slot i holds data[i] and the
+index of the next slot in next[i] (-1 marks the end). The indices live in a bytearray viewed as signed 64-bit integers
+(the stdlib `array` module is shadowed by array.py in this folder), so each link costs 8 bytes. Slots freed by delete
+are chained into a free list and reused by later inserts, so the arrays only grow when every slot is in use."""
+
+
+class CompactLinkedList:
+    def __init__(self, iterable: Optional[Iterable[Any]] = None):
+        self.data = []
+        self.next = memoryview(bytearray(8 * 16)).cast("q")
+        self.head = -1
+        self.tail = -1
+        self.free = -1  # First free slot; free slots are chained through `next`
+        self.size = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        data, nxt = self.data, self.next
+        current = self.head
+        while current != -1:
+            yield data[current]
+            current = nxt[current]
+
+    def is_empty(self) -> bool:
+        return self.head == -1
+
+    def _allocate(self, data: Any) -> int:
+        slot = self.free
+        if slot == -1:
+            slot = len(self.data)
+            if slot == len(self.next):
+                self._grow()
+            self.data.append(data)
+            self.next[slot] = -1
+        else:
+            self.free = self.next[slot]
+            self.data[slot] = data
+            self.next[slot] = -1
+        return slot
+
+    def _grow(self) -> None:
+        # Double the capacity of the index buffer, copying the existing links over.
+        buffer = bytearray(2 * self.next.nbytes)
+        buffer[:self.next.nbytes] = self.next.cast("B")
+        self.next = memoryview(buffer).cast("q")
+
+    def _release(self, slot: int) -> None:
+        self.data[slot] = None  # Drop the reference so the value can be garbage collected
+        self.next[slot] = self.free
+        self.free = slot
+
+    def append(self, data: Any) -> None:
+        slot = self._allocate(data)
+        if self.head == -1:
+            self.head = slot
+        else:
+            self.next[self.tail] = slot
+        self.tail = slot
+        self.size += 1
+
+    def prepend(self, data: Any) -> None:
+        slot = self._allocate(data)
+        self.next[slot] = self.head
+        self.head = slot
+        if self.tail == -1:
+            self.tail = slot
+        self.size += 1
+
+    def extend(self, iterable: Iterable[Any]) -> None:
+        for data in iterable:
+            self.append(data)
+
+    def delete(self, data: Any) -> None:
+        nxt = self.next
+        previous = -1
+        current = self.head
+        while current != -1:
+            if self.data[current] == data:
+                if previous == -1:
+                    self.head = nxt[current]
+                else:
+                    nxt[previous] = nxt[current]
+                if current == self.tail:
+                    self.tail = previous
+                self._release(current)
+                self.size -= 1
+                return
+            previous = current
+            current = nxt[current]
+
+    def display(self) -> None:
+        print(" -> ".join(map(str, self)))
+
+
+compact_linked_list = CompactLinkedList([1, 2, 3])
+
+compact_linked_list.delete(2)
+compact_linked_list.append(4)  # Reuses the slot freed by deleting 2
+
+compact_linked_list.display()  # Output: 1 -> 3 -> 4
+
+
+# =================================================== Indexed Doubly Linked List ==============================
+
+"""In a doubly linked list every node also points back to the previous node, so a node can be unlinked without
+walking to its predecessor. Keeping a dictionary from value to node on top of that makes delete, move-to-front and
+move-to-back O(1). Values must be hashable and unique within the list."""
+
+
+class DoublyNode:
+    __slots__ = ("data", "prev", "next")
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.prev = None
+        self.next = None
+
+
+class IndexedDoublyLinkedList:
+    def __init__(self, iterable: Optional[Iterable[Hashable]] = None):
+        self.head = None
+        self.tail = None
+        self.index: Dict[Hashable, DoublyNode] = {}
+        if iterable is not None:
+            for data in iterable:
+                self.append(data)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, data: Hashable) -> bool:
+        return data in self.index
+
+    def __iter__(self) -> Iterator[Hashable]:
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
+
+    def is_empty(self) -> bool:
+        return self.head is None
+
+    def _new_node(self, data: Hashable) -> DoublyNode:
+        if data in self.index:
+            raise ValueError(f"{data!r} is already in the list.")
+        node = self.index[data] = DoublyNode(data)
+        return node
+
+    def _link_front(self, node: DoublyNode) -> None:
+        node.prev = None
+        node.next = self.head
+        if self.head is None:
+            self.tail = node
+        else:
+            self.head.prev = node
+        self.head = node
+
+    def _link_back(self, node: DoublyNode) -> None:
+        node.next = None
+        node.prev = self.tail
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+
+    def _unlink(self, node: DoublyNode) -> None:
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+
+    def append(self, data: Hashable) -> None:
+        self._link_back(self._new_node(data))
+
+    def prepend(self, data: Hashable) -> None:
+        self._link_front(self._new_node(data))
+
+    def delete(self, data: Hashable) -> None:
+        node = self.index.pop(data, None)
+        if node is not None:
+            self._unlink(node)
+
+    def move_to_front(self, data: Hashable) -> None:
+        node = self.index[data]
+        if node is not self.head:
+            self._unlink(node)
+            self._link_front(node)
+
+    def move_to_back(self, data: Hashable) -> None:
+        node = self.index[data]
+        if node is not self.tail:
+            self._unlink(node)
+            self._link_back(node)
+
+    def pop_front(self) -> Hashable:
+        if self.head is None:
+            raise IndexError("List is empty.")
+        node = self.head
+        self._unlink(node)
+        del self.index[node.data]
+        return node.data
+
+    def pop_back(self) -> Hashable:
+        if self.tail is None:
+            raise IndexError("List is empty.")
+        node = self.tail
+        self._unlink(node)
+        del self.index[node.data]
+        return node.data
+
+    def display(self) -> None:
+        print(" <-> ".join(map(str, self)))
+
+
+indexed_list = IndexedDoublyLinkedList([1, 2, 3, 4])
+
+indexed_list.delete(3)
+indexed_list.move_to_front(4)
+
+indexed_list.display()  # Output: 4 <-> 1 <-> 2
+
+
+class LRUCache:
+    """A fixed-capacity cache that evicts the least recently used key, built on IndexedDoublyLinkedList.
+
+    Keys are kept in recency order: the front of the list is the least recently used key and the back the most
+    recently used one, so every lookup and eviction is O(1).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self.order = IndexedDoublyLinkedList()
+        self.values: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.values
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self.values:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.order.move_to_back(key)
+        return self.values[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if key in self.values:
+            self.order.move_to_back(key)
+        else:
+            if len(self.values) >= self.capacity:
+                del self.values[self.order.pop_front()]
+                self.evictions += 1
+            self.order.append(key)
+        self.values[key] = value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        # Only keys that are present end up in the result; absent keys count as misses.
+        found = {}
+        for key in keys:
+            if key in self.values:
+                self.hits += 1
+                self.order.move_to_back(key)
+                found[key] = self.values[key]
+            else:
+                self.misses += 1
+        return found
+
+    def put_many(self, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        for key, value in items:
+            self.put(key, value)
+
+    def keys(self) -> List[Hashable]:
+        # Least recently used first.
+        return list(self.order)
+
+
+lru_cache = LRUCache(2)
+
+lru_cache.put_many([("a", 1), ("b", 2)])
+lru_cache.get("a")
+lru_cache.put("c", 3)  # Evicts "b", the least recently used key
+
+print(lru_cache.keys())  # Output: ['a', 'c']
+print(lru_cache.get_many(["a", "b", "c"]))  # Output: {'a': 1, 'c': 3}
+print(lru_cache.hits, lru_cache.misses, lru_cache.evictions)  # Output: 3 1 1